@@ -12,12 +12,21 @@ Instead of manually opening a database connection inside every function
 give me the result, and clean it up when I'm done."
 """
 
-from fastapi import FastAPI, Depends, HTTPException
-from fastapi.responses import RedirectResponse
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Header, HTTPException
+from fastapi.responses import FileResponse, ORJSONResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.types import Scope
+from sqlalchemy import bindparam, delete, insert, select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+import anyio
+import asyncio
+import itertools
+import logging
 import os
+import uuid
 
 # RELATIVE IMPORTS
 # We import our other files using the dot notation.
@@ -28,17 +37,142 @@ from . import models, schemas, database
 # This looks at our models.py and creates the tables in SQLite if they don't exist.
 models.Base.metadata.create_all(bind=database.engine)
 
-app = FastAPI(title="Professional Note Taking API")
+logger = logging.getLogger(__name__)
+
+# DATABASE MAINTENANCE
+# How often to checkpoint the WAL file, and how many checkpoints between 'PRAGMA optimize' runs.
+MAINTENANCE_INTERVAL_SECONDS = 300
+OPTIMIZE_EVERY_N_CHECKPOINTS = 12
+
+async def run_maintenance_step(step):
+    """
+    Run one blocking maintenance PRAGMA in a worker thread (so it doesn't block the event loop).
+    A failure (e.g. a locked database or a disk error) is logged instead of raised, so one bad
+    run never stops future maintenance or the server shutdown.
+    """
+    try:
+        await asyncio.to_thread(step)
+    except Exception:
+        logger.exception("Database maintenance step %s failed", step.__name__)
+
+async def run_db_maintenance():
+    """
+    Background loop: checkpoint the WAL every few minutes and refresh the
+    query-planner statistics roughly once an hour.
+    """
+    checkpoints = 0
+    while True:
+        await asyncio.sleep(MAINTENANCE_INTERVAL_SECONDS)
+        await run_maintenance_step(database.checkpoint_wal)
+        checkpoints += 1
+        if checkpoints % OPTIMIZE_EVERY_N_CHECKPOINTS == 0:
+            await run_maintenance_step(database.optimize)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Runs once when the server starts (before `yield`) and once when it stops (after `yield`).
+    """
+    maintenance_task = asyncio.create_task(run_db_maintenance())
+    try:
+        yield
+    finally:
+        maintenance_task.cancel()
+        # return_exceptions=True: wait for the task to stop whether it was cancelled or crashed.
+        await asyncio.gather(maintenance_task, return_exceptions=True)
+        await run_maintenance_step(database.optimize)
+
+# WHY ORJSONResponse? It serializes every endpoint's JSON with orjson (written in Rust),
+# which is much faster than the standard library `json` module for large note lists.
+app = FastAPI(
+    title="Professional Note Taking API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 @app.get("/")
 def read_root():
     """Redirect root URL to the UI."""
     return RedirectResponse(url="/ui/")
 
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that keeps file contents in memory.
+
+    The plain StaticFiles re-opens and streams the file from disk on every request.
+    Our frontend is a single small index.html, so we read it once and serve the bytes
+    from a dict. The cache entry is keyed on the file's modification time, so editing
+    the file on disk still takes effect immediately.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache = {}  # full_path -> (mtime_ns, headers, body)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+
+        # Only plain full-file GETs are cached; 304s, 404s, HEAD and Range requests pass through.
+        if (
+            not isinstance(response, FileResponse)
+            or response.status_code != 200
+            or scope["method"] != "GET"
+            or "range" in Headers(scope=scope)
+        ):
+            return response
+
+        mtime_ns = response.stat_result.st_mtime_ns
+        cached = self._cache.get(response.path)
+        if cached is None or cached[0] != mtime_ns:
+            body = await anyio.Path(response.path).read_bytes()
+            # Keep FileResponse's headers (content-type, etag, last-modified) with the bytes,
+            # but not content-length: the file may have changed between the stat and the read,
+            # so Response recomputes it from the body we actually send.
+            headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+            cached = (mtime_ns, headers, body)
+            self._cache[response.path] = cached
+
+        _, headers, body = cached
+        return Response(body, headers=headers)
+
 # SERVING STATIC FILES (The Frontend)
 # We calculate the absolute path to the 'static' folder to avoid path errors on Windows.
 static_path = os.path.join(os.path.dirname(__file__), "static")
-app.mount("/ui", StaticFiles(directory=static_path, html=True), name="static")
+app.mount("/ui", CachedStaticFiles(directory=static_path, html=True), name="static")
+
+# --- NOTES VERSION (for ETag caching) ---
+# Every successful write bumps this number, so "same version" means "same notes".
+# GET /notes/ sends it as an ETag; when the client sends it back in If-None-Match
+# and nothing changed, we answer 304 Not Modified without touching the database.
+# The random prefix makes ETags from before a server restart never match.
+# NOTE: The counter lives in this process, so this assumes a single uvicorn worker.
+_ETAG_PREFIX = uuid.uuid4().hex[:8]
+_version_counter = itertools.count(1)  # next() is atomic under the GIL, unlike `x += 1`
+_notes_version = 0
+
+def _bump_notes_version():
+    global _notes_version
+    _notes_version = next(_version_counter)
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Weak comparison (RFC 9110): `W/"x"` and `"x"` count as the same tag.
+    If-None-Match may list several tags separated by commas, or be `*` (matches anything).
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+# --- PREBUILT STATEMENTS ---
+# Built once at import time instead of on every request. The values are passed in as
+# parameters at execute() time, so SQLAlchemy also reuses the compiled SQL from its cache.
+_INSERT_NOTE = insert(models.Note).returning(models.Note.id, models.Note.created_at)
+_DELETE_NOTE = (
+    delete(models.Note)
+    .where(models.Note.id == bindparam("note_id"))
+    .execution_options(synchronize_session=False)
+)
 
 # --- API ENDPOINTS ---
 
@@ -49,38 +183,71 @@ def create_note(note: schemas.NoteCreate, db: Session = Depends(database.get_db)
     1. Validates input using 'NoteCreate' schema.
     2. Opens DB session.
     3. Saves data.
-    4. Returns the saved object (including the new ID).
+    4. Returns the saved note (including the new ID).
     """
-    # Convert Pydantic schema -> SQLAlchemy model
-    db_note = models.Note(title=note.title, content=note.content)
-    
-    db.add(db_note)      # Add to transaction
+    # WHY INSERT ... RETURNING?
+    # add() + commit() + refresh() needs a second SELECT to read back the generated
+    # ID and created_at. RETURNING hands them back from the INSERT itself.
+    row = db.execute(_INSERT_NOTE, {"title": note.title, "content": note.content}).one()
     db.commit()          # Save to file
-    db.refresh(db_note)  # Reload to get the generated ID and created_at
-    return db_note
+    _bump_notes_version()
+    return {"id": row.id, "title": note.title, "content": note.content, "created_at": row.created_at}
 
-@app.get("/notes/", response_model=List[schemas.NoteResponse])
-def read_notes(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db)):
+# WHY NO response_model HERE?
+# With response_model, FastAPI builds and validates a Pydantic NoteResponse for every row.
+# This is the most-called endpoint, so we build the JSON-ready dicts ourselves and hand them
+# straight to orjson. `responses=` keeps the schema in the /docs page.
+@app.get("/notes/", response_model=None, responses={200: {"model": List[schemas.NoteResponse]}})
+def read_notes(
+    cursor: Optional[int] = None,
+    limit: int = 100,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(database.get_db),
+) -> Response:
     """
-    Get all notes with pagination.
-    skip: How many to skip (for page 2, 3, etc.)
+    Get all notes with pagination, newest first.
+    cursor: The ID of the last note you received (for page 2, 3, etc.)
     limit: Max number to return (prevents crashing if you have 1M notes)
+
+    WHY A CURSOR INSTEAD OF 'skip'?
+    OFFSET makes SQLite walk past every skipped row, so deep pages get slower and slower.
+    "WHERE id < cursor" jumps straight to the right spot in the primary key index.
     """
-    notes = db.query(models.Note).offset(skip).limit(limit).all()
-    return notes
+    # Read the version BEFORE querying: if a write lands in between, the client gets
+    # newer data under an older ETag and simply re-downloads next time (never stale data).
+    # cursor and limit are part of the tag: each page is a different result set.
+    etag = f'W/"{_ETAG_PREFIX}-{_notes_version}-{cursor}-{limit}"'
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # WHY select() OF COLUMNS INSTEAD OF db.query(models.Note)?
+    # Plain rows skip building full ORM objects and registering them in the session,
+    # which we don't need for a read-only list.
+    query = (
+        select(models.Note.id, models.Note.title, models.Note.content, models.Note.created_at)
+        .order_by(models.Note.id.desc())
+        .limit(limit)
+    )
+    if cursor is not None:
+        query = query.where(models.Note.id < cursor)
+    rows = db.execute(query).mappings()
+    # orjson serializes the created_at datetime natively (ISO 8601).
+    return ORJSONResponse([dict(row) for row in rows], headers={"ETag": etag})
 
 @app.delete("/notes/{note_id}")
 def delete_note(note_id: int, db: Session = Depends(database.get_db)):
     """
     Delete a note by its ID.
     """
-    # Try to find the note
-    note = db.query(models.Note).filter(models.Note.id == note_id).first()
+    # WHY A SINGLE DELETE STATEMENT?
+    # Loading the note first (SELECT) and then deleting it costs two queries.
+    # "DELETE ... WHERE id = ?" does both jobs at once and tells us how many rows it removed.
+    result = db.execute(_DELETE_NOTE, {"note_id": note_id})
+    db.commit()
     
     # Handle the "Not Found" error gracefully
-    if note is None:
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Note not found")
     
-    db.delete(note)
-    db.commit()
+    _bump_notes_version()
     return {"status": "success", "message": "Note deleted"}
\ No newline at end of file
@@ -28,9 +28,8 @@ def create_project_structure():
     ]
 
     for file_path in files_to_create:
-        # 'touch' the file (create if not exists)
-        with open(file_path, "w") as f:
-            pass 
+        # 'touch' the file (create if not exists, never truncate existing code)
+        file_path.touch(exist_ok=True)
         print(f"📄 Created empty file: {file_path}")
 
     print(f"\n🚀 Success! Project structure ready in '{PROJECT_NAME}'")